@@ -12,6 +12,9 @@ setup(
         "requests",
         "pytz"
     ],
+    extras_require={
+        "fast": ["orjson"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -1,9 +1,23 @@
 import json
+import socket
+import threading
 from unittest.mock import patch, MagicMock
 
 import pytest
+import requests
 
-from transitsync_routing.api_client import APIClient, haversine_distance
+from transitsync_routing.api_client import (
+    APIClient, CircuitBreaker, CircuitOpenError, haversine_distance, _haversine_score, _RateLimiter,
+    _normalize_address_cached,
+)
+
+
+def make_response(payload, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode()
+    return response
 
 
 def test_haversine_distance_basic():
@@ -12,6 +26,13 @@ def test_haversine_distance_basic():
     assert 111 <= dist <= 112
 
 
+def test_haversine_score_preserves_ordering():
+    near = _haversine_score(-41.0, 174.0, -41.01, 174.01)
+    far = _haversine_score(-41.0, 174.0, -41.2, 174.2)
+    assert near < far
+    assert haversine_distance(-41.0, 174.0, -41.01, 174.01) < haversine_distance(-41.0, 174.0, -41.2, 174.2)
+
+
 def test_normalize_address_context():
     client = APIClient()
     result = client._normalize_address('Te Papa')
@@ -26,11 +47,9 @@ def test_normalize_address_vuw_code():
 
 def test_geocode_address_cache():
     client = APIClient()
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [{"lat": "-41.1", "lon": "174.9"}]
+    mock_response = make_response([{"lat": "-41.1", "lon": "174.9"}])
 
-    with patch('requests.get', return_value=mock_response) as mock_get:
+    with patch.object(client.session, 'get', return_value=mock_response) as mock_get:
         coords1 = client.geocode_address('Some Place')
         assert coords1 == (-41.1, 174.9)
         # second call should use cache
@@ -41,12 +60,240 @@ def test_geocode_address_cache():
 
 def test_find_nearest_stop():
     client = APIClient()
-    mock_response = MagicMock()
-    mock_response.status_code = 200
-    mock_response.json.return_value = [
+    mock_response = make_response([
         {"stop_id": "1", "stop_name": "A", "stop_lat": -41.0, "stop_lon": 174.0},
         {"stop_id": "2", "stop_name": "B", "stop_lat": -41.1, "stop_lon": 174.1},
-    ]
-    with patch('requests.get', return_value=mock_response):
+    ])
+    with patch.object(client.session, 'get', return_value=mock_response):
         stop = client.find_nearest_stop(-41.05, 174.05)
         assert stop.stop_id == "2"
+
+
+def test_geocode_address_cache_ignores_case():
+    client = APIClient()
+    mock_response = make_response([{"lat": "-41.1", "lon": "174.9"}])
+
+    with patch.object(client.session, 'get', return_value=mock_response) as mock_get, \
+         patch('time.sleep'):
+        assert client.geocode_address('Cuba Street') == (-41.1, 174.9)
+        assert client.geocode_address('cuba street') == (-41.1, 174.9)
+        mock_get.assert_called_once()
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+    with patch('time.monotonic', return_value=100.0):
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+    with patch('time.monotonic', return_value=111.0):
+        # one probe after the reset timeout, then closed again on success
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+
+
+def test_send_fails_fast_when_circuit_open():
+    client = APIClient()
+    mock_response = MagicMock()
+    mock_response.status_code = 503
+    with patch.object(client.session, 'get', return_value=mock_response) as mock_get:
+        for _ in range(5):
+            client._send("get", "https://example.org/a")
+        with pytest.raises(CircuitOpenError):
+            client._send("get", "https://example.org/b")
+        assert mock_get.call_count == 5
+
+
+def test_json_helpers_without_orjson():
+    from transitsync_routing import api_client
+    response = make_response({"departures": []})
+    with patch.object(api_client, 'orjson', None):
+        assert api_client._parse_json(response) == {"departures": []}
+        assert json.loads(api_client._dump_json({"a": 1})) == {"a": 1}
+
+
+def test_geocode_address_uses_disk_cache(tmp_path):
+    cache_path = str(tmp_path / "geocode.sqlite")
+    mock_response = make_response([{"lat": "-41.1", "lon": "174.9"}])
+
+    first = APIClient(geocode_cache_path=cache_path)
+    with patch.object(first.session, 'get', return_value=mock_response), patch('time.sleep'):
+        assert first.geocode_address('Cuba Street') == (-41.1, 174.9)
+    first.disk_cache.close()
+
+    second = APIClient(geocode_cache_path=cache_path)
+    with patch.object(second.session, 'get') as mock_get, patch('time.sleep') as mock_sleep:
+        assert second.geocode_address('cuba street') == (-41.1, 174.9)
+        mock_get.assert_not_called()
+        mock_sleep.assert_not_called()
+
+
+def test_rate_limiter_only_waits_for_the_remaining_interval():
+    limiter = _RateLimiter(1.0)
+    with patch('time.monotonic', side_effect=[100.0, 100.25, 105.0]), patch('time.sleep') as mock_sleep:
+        limiter.acquire()
+        mock_sleep.assert_not_called()
+        limiter.acquire()
+        mock_sleep.assert_called_once_with(0.75)
+        limiter.acquire()
+        assert mock_sleep.call_count == 1
+
+
+def test_find_nearest_stop_skips_invalid_records():
+    client = APIClient()
+    mock_response = make_response({"stops": [
+        {"stop_id": "1", "stop_name": "A", "stop_lat": "not a number", "stop_lon": 174.05},
+        {"stop_id": "2", "stop_name": "B"},
+        {"stop_id": "3", "stop_name": "C", "stop_lat": "-41.2", "stop_lon": "174.2"},
+    ]})
+    with patch.object(client.session, 'get', return_value=mock_response):
+        stop = client.find_nearest_stop(-41.05, 174.05)
+    assert (stop.stop_id, stop.name, stop.lat, stop.lon) == ("3", "C", -41.2, 174.2)
+
+
+def test_find_nearest_stop_fetches_stops_once():
+    client = APIClient()
+    mock_response = make_response([
+        {"stop_id": "1", "stop_name": "A", "stop_lat": -41.0, "stop_lon": 174.0},
+        {"stop_id": "2", "stop_name": "B", "stop_lat": -41.3, "stop_lon": 174.8},
+    ])
+    with patch.object(client.session, 'get', return_value=mock_response) as mock_get:
+        assert client.find_nearest_stop(-41.01, 174.01).stop_id == "1"
+        assert client.find_nearest_stop(-41.29, 174.79).stop_id == "2"
+        # Same ~100 m cell as the previous query
+        assert client.find_nearest_stop(-41.2901, 174.7901).stop_id == "2"
+        mock_get.assert_called_once()
+
+
+def test_find_nearest_stop_matches_haversine_score():
+    client = APIClient()
+    points = [(-41.28, 174.77), (-41.30, 174.78), (-41.29, 174.76), (-41.31, 174.80)]
+    mock_response = make_response([
+        {"stop_id": str(i), "stop_name": str(i), "stop_lat": la, "stop_lon": lo}
+        for i, (la, lo) in enumerate(points)
+    ])
+    with patch.object(client.session, 'get', return_value=mock_response):
+        for lat, lon in [(-41.285, 174.772), (-41.305, 174.79), (-41.292, 174.761)]:
+            expected = min(range(len(points)), key=lambda i: _haversine_score(lat, lon, *points[i]))
+            assert client.find_nearest_stop(lat, lon).stop_id == str(expected)
+
+
+def test_haversine_distance_antipodal():
+    # Half the Earth's circumference for R = 6371 km
+    assert haversine_distance(0, 0, 0, 180) == pytest.approx(20015.09, abs=0.01)
+
+
+def test_find_nearest_stop_falls_back_outside_latitude_band():
+    client = APIClient()
+    mock_response = make_response([
+        # Within the latitude band but far away in longitude
+        {"stop_id": "1", "stop_name": "A", "stop_lat": -41.05, "stop_lon": 178.0},
+        # Outside the band but much closer
+        {"stop_id": "2", "stop_name": "B", "stop_lat": -41.5, "stop_lon": 174.0},
+    ])
+    with patch.object(client.session, 'get', return_value=mock_response):
+        assert client.find_nearest_stop(-41.0, 174.0).stop_id == "2"
+
+
+def test_normalize_address_is_memoized():
+    client = APIClient()
+    _normalize_address_cached.cache_clear()
+    assert client._normalize_address('Te Papa') == client._normalize_address('Te Papa')
+    info = _normalize_address_cached.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_query_otp_graphql_reuses_recent_results():
+    client = APIClient()
+    result = {"data": {"plan": {"itineraries": []}}}
+    variables = {"fromLat": -41.1, "fromLon": 174.7, "time": "08:45am", "date": "2025-04-10"}
+    with patch.object(client, '_query_otp_graphql', return_value=result) as mock_query:
+        assert client.query_otp_graphql("query", variables) is result
+        assert client.query_otp_graphql("query", dict(variables)) is result
+        mock_query.assert_called_once()
+        client.query_otp_graphql("query", {**variables, "time": "09:45am"})
+        assert mock_query.call_count == 2
+
+
+def test_query_otp_graphql_caches_nested_variables():
+    client = APIClient()
+    result = {"data": {"plan": {"itineraries": []}}}
+    variables = {"from": {"lat": 1, "lon": 2}, "modes": [{"mode": "WALK"}]}
+    with patch.object(client, '_query_otp_graphql', return_value=result) as mock_query:
+        assert client.query_otp_graphql("query", variables) is result
+        assert client.query_otp_graphql("query", variables) is result
+        mock_query.assert_called_once()
+
+
+def test_otp_cache_is_bounded_and_drops_expired_entries():
+    client = APIClient()
+    client.otp_cache_maxsize = 2
+    with patch('time.monotonic', return_value=100.0):
+        client._store_otp_result(b"a", {"data": 1})
+        client._store_otp_result(b"b", {"data": 2})
+        client._store_otp_result(b"c", {"data": 3})
+    assert list(client._otp_cache) == [b"b", b"c"]
+
+    with patch('time.monotonic', return_value=100.0 + client.otp_cache_ttl):
+        client._store_otp_result(b"d", {"data": 4})
+    assert list(client._otp_cache) == [b"d"]
+
+
+def test_send_does_not_retry_read_timeouts():
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+    accepted = []
+
+    def accept():
+        # Accept connections but never answer, like a hung server
+        while True:
+            try:
+                accepted.append(server.accept()[0])
+            except OSError:
+                return
+
+    threading.Thread(target=accept, daemon=True).start()
+    client = APIClient()
+    url = f"http://127.0.0.1:{server.getsockname()[1]}/graphql"
+    try:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            client._send("post", url, data=b"{}", timeout=(1, 0.1))
+        assert len(accepted) == 1
+    finally:
+        server.close()
+        for conn in accepted:
+            conn.close()
+
+
+def test_nominatim_requests_are_not_retried_by_the_adapter():
+    client = APIClient()
+    assert client.session.get_adapter(client.osm_url + "?q=x").max_retries.total == 0
+    assert client.session.get_adapter(client.otp_base_url + "/graphql").max_retries.total == 3
+
+
+def test_find_nearest_stop_cells_expire_with_stop_list():
+    client = APIClient()
+    old_response = make_response([{"stop_id": "1", "stop_name": "A", "stop_lat": -41.0, "stop_lon": 174.0}])
+    new_response = make_response([{"stop_id": "2", "stop_name": "B", "stop_lat": -41.0, "stop_lon": 174.0}])
+    with patch.object(client.session, 'get', side_effect=[old_response, new_response]) as mock_get:
+        with patch('time.monotonic', return_value=1000.0):
+            assert client.find_nearest_stop(-41.0, 174.0).stop_id == "1"
+            assert client.find_nearest_stop(-41.0, 174.0).stop_id == "1"
+        with patch('time.monotonic', return_value=1000.0 + client.stops_ttl):
+            assert client.find_nearest_stop(-41.0, 174.0).stop_id == "2"
+        assert mock_get.call_count == 2
+
+
+def test_retries_ignore_retry_after_header():
+    client = APIClient()
+    retry = client.session.get_adapter(client.otp_base_url + "/graphql").max_retries
+    assert retry.respect_retry_after_header is False
+    response = MagicMock(status=503)
+    response.headers = {"Retry-After": "3600"}
+    with patch('time.sleep') as mock_sleep:
+        retry.sleep(response)
+    assert all(call.args[0] < 1 for call in mock_sleep.call_args_list)
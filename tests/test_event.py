@@ -1,6 +1,6 @@
 import datetime
 import pytest
-from transitsync_routing.event import Event
+from transitsync_routing.event import Event, parse_datetime
 
 
 def test_parse_datetime_valid_and_invalid():
@@ -12,6 +12,12 @@ def test_parse_datetime_valid_and_invalid():
     assert e2.start_time is None
 
 
+def test_parse_datetime_handles_utc_suffix():
+    parsed = parse_datetime("2025-01-01T10:00:00Z")
+    assert parsed == datetime.datetime(2025, 1, 1, 10, 0, tzinfo=datetime.timezone.utc)
+    assert parse_datetime("2025-01-01T10:00:00Z") is parsed
+
+
 def test_to_dict_roundtrip():
     data = {
         "summary": "meeting",
@@ -26,3 +32,24 @@ def test_to_dict_roundtrip():
     assert result["location"] == data["location"]
     assert result["start"]["dateTime"].startswith("2025-01-01T09:00:00")
     assert result["end"]["dateTime"].startswith("2025-01-01T10:00:00")
+
+
+def test_from_attributes_matches_dict_construction():
+    data = {
+        "summary": "Transit: A to B",
+        "location": "Transit from A to B",
+        "description": "Desc",
+        "start": {"dateTime": "2025-01-01T09:00:00", "timeZone": "Pacific/Auckland"},
+        "end": {"dateTime": "2025-01-01T09:30:00", "timeZone": "Pacific/Auckland"},
+    }
+    expected = Event(data)
+    event = Event.from_attributes(
+        summary="Transit: A to B",
+        location="Transit from A to B",
+        description="Desc",
+        start_time=datetime.datetime(2025, 1, 1, 9, 0),
+        end_time=datetime.datetime(2025, 1, 1, 9, 30),
+        time_zone="Pacific/Auckland",
+    )
+    assert event.to_dict() == expected.to_dict()
+    assert event.start_str == expected.start_str
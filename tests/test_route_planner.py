@@ -2,7 +2,7 @@ import datetime
 from unittest.mock import patch, MagicMock
 
 from transitsync_routing.event import Event
-from transitsync_routing.route_planner import RoutePlanner
+from transitsync_routing.route_planner import RoutePlanner, _clock_time, _otp_time_and_date
 
 
 def make_event(summary, location, start):
@@ -22,6 +22,15 @@ def test_is_suitable_event_filters():
     # event with online location
     e2 = make_event("B", "Online meeting", datetime.datetime.now())
     assert not planner.is_suitable_event(e2)
+    # event created by the bot
+    e3 = make_event("Transit: Home to Work", "Somewhere", datetime.datetime.now())
+    assert not planner.is_suitable_event(e3)
+    # regular event
+    e4 = make_event("Lecture", "Kelburn Campus", datetime.datetime.now())
+    assert planner.is_suitable_event(e4)
+    # event too far in the future
+    e5 = make_event("Later", "Kelburn Campus", datetime.datetime.now() + datetime.timedelta(days=45))
+    assert not planner.is_suitable_event(e5)
 
 
 def test_plan_route_between_events():
@@ -57,3 +66,183 @@ def test_plan_route_between_events():
         assert route["from_event"] == "Start"
         assert route["to_event"] == "End"
         assert route["estimated_travel_time_minutes"] == 10
+        assert route["predicted_departure_dt"] == datetime.datetime.fromtimestamp(1600000000)
+        assert route["predicted_departure"] == route["predicted_departure_dt"].isoformat()
+
+
+def test_plan_routes_for_events_keeps_pair_order():
+    events = [
+        make_event(name, f"Loc{name}", datetime.datetime(2025, 1, 1, 9 + i, 0))
+        for i, name in enumerate(["A", "B", "C", "D"])
+    ]
+    planner = RoutePlanner(list(reversed(events)))
+
+    def fake_plan(e1, e2, geocoded=None):
+        if e1.summary == "B":
+            return None
+        return {"from_event": e1.summary, "to_event": e2.summary}
+
+    def fake_geocode(location):
+        return (-41.0 - 0.1 * "ABCD".index(location[-1]), 174.0)
+
+    with patch.object(planner, 'plan_route_between_events', side_effect=fake_plan), \
+         patch.object(planner.api_client, 'geocode_address', side_effect=fake_geocode) as mock_geocode:
+        routes = planner.plan_routes_for_events()
+
+    assert mock_geocode.call_count == 4
+    assert [(r["from_event"], r["to_event"]) for r in routes] == [("A", "B"), ("C", "D")]
+
+
+def test_process_events_geocodes_each_location_once():
+    start = datetime.datetime.now() + datetime.timedelta(days=1)
+    events = [
+        make_event("A", "Loc1", start),
+        make_event("B", "Loc2", start + datetime.timedelta(hours=2)),
+        make_event("C", "Loc3", start + datetime.timedelta(hours=4)),
+    ]
+    planner = RoutePlanner(events)
+
+    with patch.object(planner.api_client, 'geocode_address', return_value=(1, 2)) as mock_geocode, \
+         patch.object(planner.api_client, 'query_otp_graphql', return_value=None):
+        planner.process_events(home_address="Home Street")
+
+    geocoded = [call.args[0] for call in mock_geocode.call_args_list]
+    assert sorted(geocoded) == ["Home Street", "Loc1", "Loc2", "Loc3"]
+
+
+def test_process_events_skips_consecutive_duplicate_locations():
+    start = datetime.datetime.now() + datetime.timedelta(days=1)
+    events = [
+        make_event("A", "Loc1", start),
+        make_event("B", " loc1 ", start + datetime.timedelta(hours=1)),
+        make_event("C", "Loc2", start + datetime.timedelta(hours=2)),
+    ]
+    planner = RoutePlanner(events)
+
+    with patch.object(planner, '_plan_pairs', return_value=[]) as mock_plan, \
+         patch.object(planner.api_client, 'geocode_address', return_value=(1, 2)):
+        planner.process_events(home_address="Loc1")
+
+    pairs = mock_plan.call_args.args[0]
+    assert [(a.summary, b.summary) for a, b in pairs] == [("A", "C")]
+
+
+def test_geocode_failures_are_not_retried():
+    planner = RoutePlanner([])
+    with patch.object(planner.api_client, 'geocode_address', return_value=None) as mock_geocode:
+        assert planner._geocode("Nowhere") is None
+        assert planner._geocode(" nowhere ") is None
+        mock_geocode.assert_called_once()
+
+
+def test_time_formatters_match_strftime():
+    for hour in (0, 9, 11, 12, 13, 23):
+        dt = datetime.datetime(2025, 4, 10, hour, 5)
+        assert _otp_time_and_date(dt) == (dt.strftime("%I:%M%p").lower(), dt.strftime("%Y-%m-%d"))
+        assert _clock_time(dt) == dt.strftime("%I:%M %p")
+
+
+def test_process_events_skips_home_leg_when_first_event_is_at_home():
+    start = datetime.datetime.now() + datetime.timedelta(days=1)
+    events = [
+        make_event("Breakfast", "My Flat, Aro Street", start),
+        make_event("Work", "Loc2", start + datetime.timedelta(hours=2)),
+    ]
+    planner = RoutePlanner(events)
+
+    with patch.object(planner, '_plan_pairs', return_value=[]) as mock_plan, \
+         patch.object(planner.api_client, 'geocode_address', return_value=(1, 2)):
+        planner.process_events(home_address="1 Willis Street")
+
+    pairs = mock_plan.call_args.args[0]
+    assert [(a.summary, b.summary) for a, b in pairs] == [("Breakfast", "Work")]
+
+
+def make_route(legs, duration=600):
+    departure = datetime.datetime(2025, 1, 1, 9, 0)
+    arrival = departure + datetime.timedelta(seconds=duration)
+    return {
+        "from_event": "Start",
+        "to_event": "End",
+        "from_location": "Loc1",
+        "to_location": "Loc2",
+        "predicted_departure": departure.isoformat(),
+        "predicted_departure_dt": departure,
+        "estimated_travel_time_minutes": duration / 60,
+        "estimated_arrival_time": arrival.isoformat(),
+        "estimated_arrival_dt": arrival,
+        "itinerary": {"duration": duration, "legs": legs},
+    }
+
+
+def test_route_to_event_walking_and_transit():
+    planner = RoutePlanner([])
+
+    walk = planner._route_to_event(make_route([{"mode": "WALK"}]))
+    assert walk.summary == "Walking: Loc1 to Loc2"
+    assert "Estimated walking time: 10.0 minutes" in walk.description
+    assert walk.start_time == datetime.datetime(2025, 1, 1, 9, 0)
+
+    transit = planner._route_to_event(make_route([{"mode": "WALK"}, {"mode": "BUS"}]))
+    assert transit.summary == "Transit: Loc1 to Loc2"
+    assert "Depart at: 09:00 AM" in transit.description
+    assert "Arrive by: 09:10 AM" in transit.description
+    assert transit.end_time == datetime.datetime(2025, 1, 1, 9, 10)
+
+    assert planner._route_to_event(make_route([])) is None
+
+
+def test_plan_routes_skips_colocated_events():
+    events = [
+        make_event("A", "Te Papa", datetime.datetime(2025, 1, 1, 9, 0)),
+        make_event("B", "Te Papa Museum", datetime.datetime(2025, 1, 1, 10, 0)),
+        make_event("C", "Wellington Zoo", datetime.datetime(2025, 1, 1, 11, 0)),
+    ]
+    planner = RoutePlanner(events)
+    coords = {
+        "Te Papa": (-41.2905, 174.7820),
+        "Te Papa Museum": (-41.2906, 174.7821),
+        "Wellington Zoo": (-41.3186, 174.7824),
+    }
+
+    with patch.object(planner.api_client, 'geocode_address', side_effect=coords.get), \
+         patch.object(planner, 'plan_route_between_events', return_value={"ok": True}) as mock_plan:
+        routes = planner.plan_routes_for_events()
+
+    assert len(routes) == 1
+    from_event, to_event = mock_plan.call_args.args[:2]
+    assert (from_event.summary, to_event.summary) == ("B", "C")
+
+
+def test_process_events_home_leg_starts_an_hour_before_first_event():
+    start = datetime.datetime.now() + datetime.timedelta(days=1)
+    events = [make_event("A", "Loc1", start)]
+    planner = RoutePlanner(events)
+
+    with patch.object(planner, '_plan_pairs', return_value=[]) as mock_plan, \
+         patch.object(planner.api_client, 'geocode_address', return_value=(1, 2)):
+        planner.process_events(home_address="Home Street")
+
+    home_event, first_event = mock_plan.call_args.args[0][0]
+    assert home_event.location == "Home Street"
+    assert home_event.start_time == first_event.start_time - datetime.timedelta(hours=1)
+    assert home_event.to_dict()["start"]["timeZone"] == "Pacific/Auckland"
+
+
+def test_process_events_handles_all_day_events_between_timed_events():
+    start = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    all_day = Event({
+        "summary": "Holiday",
+        "location": "Beach",
+        "start": {"date": start.date().isoformat()},
+        "end": {"date": (start.date() + datetime.timedelta(days=1)).isoformat()},
+    })
+    first = make_event("A", "Loc1", start)
+    second = make_event("B", "Loc2", start + datetime.timedelta(hours=2))
+    planner = RoutePlanner([first, all_day, second])
+
+    with patch.object(planner, '_plan_pairs', return_value=[]) as mock_plan, \
+         patch.object(planner.api_client, 'geocode_address', return_value=(1, 2)):
+        assert planner.process_events(home_address="Loc1") == []
+
+    assert mock_plan.call_args.args[0] == [(first, second)]
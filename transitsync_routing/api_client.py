@@ -1,12 +1,83 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit
+from bisect import bisect_left, bisect_right
 import logging
 import time
+import threading
 import math
-import datetime
+import json
 import re
-import os
+from functools import lru_cache
 from .stop import Stop
 from .config import Config
+from .geocode_cache import GeocodeCache
+
+# orjson is optional; it parses and serializes JSON several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# VUW room codes such as "CO246": a building prefix followed by a room number
+_VUW_CODE_RE = re.compile(r'^([A-Za-z]{2,4})(\d{1,3})$')
+_VUW_BUILDINGS = {
+    "CO": "Cotton Building",
+    "MY": "Murphy Building",
+    "MYLT": "Murphy Lecture Theatre",
+    "KK": "Kirk Building",
+    "HM": "Hugh Mackenzie Building",
+    "EA": "Easterfield Building",
+    "VZ": "von Zedlitz Building",
+    "MC": "Maclaurin Building",
+    "AM": "Alan MacDiarmid Building"
+}
+_VUW_CAMPUS_ADDRESS = "Kelburn Parade, Kelburn, Wellington 6012, New Zealand"
+
+# Words indicating the address already names a street; matched in one scan
+_STREET_WORDS_RE = re.compile("street|road|avenue|drive")
+
+
+@lru_cache(maxsize=4096)
+def _normalize_address_cached(address):
+    """
+    Normalization behind APIClient._normalize_address. It depends only on the
+    address, so repeated locations skip the regex and string work.
+    """
+    normalized = address.strip()
+           
+    # Handle VUW building codes like "CO246". These are at most 7 characters
+    # long, so ordinary street addresses skip the regex entirely.
+    if len(normalized) <= 7:
+        match = _VUW_CODE_RE.match(normalized)
+        if match and match.group(1).upper() in _VUW_BUILDINGS:
+            logging.info("Recognized VUW room code '%s' -> '%s'", address, _VUW_CAMPUS_ADDRESS)
+            return _VUW_CAMPUS_ADDRESS
+
+    # Append Wellington/New Zealand context if missing details.
+    lowered = normalized.lower()
+    if "wellington" not in lowered and "new zealand" not in lowered:
+        if not _STREET_WORDS_RE.search(lowered):
+            original = normalized
+            normalized = f"{normalized}, Wellington, New Zealand"
+            logging.info("Added Wellington context: '%s' -> '%s'", original, normalized)
+    
+    return normalized
+
+
+def _parse_json(response):
+    """Decodes a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _dump_json(payload):
+    """Encodes a request payload as UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
 
 
 def haversine_distance(lat1, lon1, lat2, lon2):
@@ -14,13 +85,107 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     Calculate the great-circle distance between two points on Earth.
     """
     R = 6371  # Earth radius in kilometers
+    a = _haversine_score(lat1, lon1, lat2, lon2)
+    # 2*asin(sqrt(a)) equals 2*atan2(sqrt(a), sqrt(1-a)) with one fewer sqrt;
+    # clamp a so rounding near antipodal points cannot leave asin's domain
+    return 2 * R * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _haversine_score(lat1, lon1, lat2, lon2):
+    """
+    Return the haversine term 'a' for two points.
+    It increases monotonically with distance, so it can be used to compare
+    distances without the sqrt/atan2 needed for kilometres.
+    """
     phi1 = math.radians(lat1)
     phi2 = math.radians(lat2)
     delta_phi = math.radians(lat2 - lat1)
     delta_lambda = math.radians(lon2 - lon1)
-    a = math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return R * c
+    return math.sin(delta_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda / 2) ** 2
+
+
+# Fields a Metlink stop record needs to be usable
+_STOP_FIELDS = ('stop_id', 'stop_name', 'stop_lat', 'stop_lon')
+
+
+def _stop_entry(stop):
+    """
+    Returns (record, lat, lon, phi, lambda, cos phi) for a Metlink stop record,
+    with the angles in radians. Raises KeyError/TypeError/ValueError if malformed.
+    """
+    # The id and name are only read for the winning stop, but must be present
+    if 'stop_id' not in stop or 'stop_name' not in stop:
+        raise KeyError("stop record is missing 'stop_id' or 'stop_name'")
+    lat = float(stop['stop_lat'])
+    lon = float(stop['stop_lon'])
+    phi = math.radians(lat)
+    return (stop, lat, lon, phi, math.radians(lon), math.cos(phi))
+
+
+class _RateLimiter:
+    """
+    Spaces calls at least `interval` seconds apart across threads.
+    Only the caller that would exceed the rate waits, and only for the remainder.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_allowed = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_allowed - now
+            if wait > 0:
+                time.sleep(wait)
+                now += wait
+            self._next_allowed = now + self.interval
+
+
+# Nominatim's usage policy allows at most one request per second
+_nominatim_limiter = _RateLimiter(1.0)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised when a request is refused because the host's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures for one host.
+    After failure_threshold failures in a row the circuit opens and calls fail
+    fast; once reset_timeout seconds have passed a single probe is let through.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=10):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_count = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Returns True if a request may be sent."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Half-open: let this probe through and hold everyone else back
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failure_count = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failure_count += 1
+            if self.failure_count >= self.failure_threshold:
+                self.opened_at = time.monotonic()
 
 
 class APIClient:
@@ -28,23 +193,145 @@ class APIClient:
     Client for interacting with Metlink and OpenStreetMap APIs.
     Handles geocoding, stop information, and OTP route planning.
     """
+
+    # Possible GraphQL endpoint paths to try (in order of preference).
+    # Shared by all instances since it never changes.
+    graphql_endpoints = (
+        "/otp/routers/default/index/graphql",  # Common path for OTP 2.x
+        "/otp/index/graphql",                  # Original path used in code
+        "/otp/graphql",                        # Alternative path
+        "/graphql"                             # Newer versions simplified path
+    )
+
+    # Content type of the pre-encoded GraphQL request bodies
+    _json_headers = {"Content-Type": "application/json"}
+
+    # (connect, read) timeouts in seconds for external HTTP calls
+    request_timeout = (3.05, 10)
+    otp_timeout = (3.05, 30)
+
+    # Maximum number of OTP plan queries in flight at once per client
+    otp_max_concurrency = 4
+    # Seconds a successful OTP result is reused for an identical query
+    otp_cache_ttl = 600
+    # Maximum number of OTP results kept; the oldest are dropped first
+    otp_cache_maxsize = 256
+
+    # Seconds the downloaded Metlink stop list is reused before refetching
+    stops_ttl = 6 * 3600
+    # Decimal places of lat/lon that share a nearest-stop result (~100 m cells)
+    nearest_stop_precision = 3
+    # Half-height in degrees of the latitude band scanned before all stops
+    nearest_stop_band = 0.1
     
-    def __init__(self, offline_mode=None):
+    def __init__(self, offline_mode=None, geocode_cache_path=None):
         """
         Initialize the API client.
+
+        Args:
+            geocode_cache_path: Optional SQLite file for persisting geocoding
+                results between runs. Defaults to Config.GEOCODE_CACHE_PATH.
         """
-        self.geocode_cache = {}  # key: normalized address, value: (lat, lon)
+        self.geocode_cache = {}  # key: lowercased normalized address, value: (lat, lon)
+        cache_path = geocode_cache_path or Config.GEOCODE_CACHE_PATH
+        self.disk_cache = GeocodeCache(
+            cache_path, max_age=Config.GEOCODE_CACHE_MAX_AGE_DAYS * 24 * 3600
+        ) if cache_path else None
+
+        # Reuse pooled connections so repeat calls skip the TCP/TLS handshake
+        # and retry transient server errors with exponential backoff. Read
+        # errors are re-raised as-is (ReadTimeout stays a Timeout) rather than
+        # retried: a hung server would otherwise cost a full read timeout per
+        # attempt.
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            read=False,
+            # Only the bounded exponential backoff applies; a server's
+            # Retry-After could otherwise stall a planner thread indefinitely
+            respect_retry_after_header=False,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Headers common to every service; Nominatim requires an identifying User-Agent
+        self.session.headers.update({
+            "User-Agent": "TransitSync/1.0 (hamishapps@gmail.com)",
+            "Accept": "application/json",
+        })
+        # The Metlink key is only sent to Metlink, so it stays out of the session headers
+        self._metlink_headers = {}
+        if hasattr(Config, 'API_KEY') and Config.API_KEY:
+            self._metlink_headers["x-api-key"] = Config.API_KEY
+
+        # Service URLs are resolved once rather than on every request
+        self.osm_url = Config.OSM_URL or "https://nominatim.openstreetmap.org/search"
+        self.otp_base_url = Config.OTP_URL or "http://localhost:8080"
+
+        # Nominatim requests are never retried by the adapter; a retry would
+        # bypass _nominatim_limiter and break the 1 req/s policy
+        self.session.mount(self.osm_url, HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+        # One circuit breaker per host, created on first use
+        self._breakers = {}
+        self._breakers_lock = threading.Lock()
             
-        # List of possible GraphQL endpoint paths to try (in order of preference)
-        self.graphql_endpoints = [
-            "/otp/routers/default/index/graphql",  # Common path for OTP 2.x
-            "/otp/index/graphql",                  # Original path used in code
-            "/otp/graphql",                        # Alternative path
-            "/graphql"                             # Newer versions simplified path
-        ]
+        # Nominatim allows one request per second, so concurrent callers
+        # take turns on the throttled request
+        self._geocode_lock = threading.Lock()
+        # Keep concurrent route planning from flooding the OTP server
+        self._otp_semaphore = threading.BoundedSemaphore(self.otp_max_concurrency)
+
         # We'll find the working endpoint on first GraphQL call
         self.working_graphql_endpoint = None
+
+        # Metlink stops as (record, lat, lon, phi, lambda, cos phi) tuples sorted
+        # by latitude, paired with their latitudes; fetched on first use
+        self._stops = None
+        self._stops_fetched_at = 0.0
+        self._stops_lock = threading.Lock()
+        # Nearest stop per rounded (lat, lon) cell
+        self._nearest_stop_cache = {}
+
+        # Successful OTP results: encoded request body -> (expires_at, result)
+        self._otp_cache = {}
+        self._otp_cache_lock = threading.Lock()
             
+    def _breaker_for(self, url):
+        """Returns the circuit breaker for the host of the given URL."""
+        host = urlsplit(url).netloc
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker()
+            return breaker
+
+    def _send(self, method, url, **kwargs):
+        """
+        Sends an HTTP request through the shared session, guarded by the
+        host's circuit breaker. Connection errors and 5xx responses count
+        as failures. Raises CircuitOpenError without sending if the host's
+        circuit is open.
+        """
+        breaker = self._breaker_for(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}, skipping request")
+        kwargs.setdefault("timeout", self.request_timeout)
+        try:
+            response = getattr(self.session, method)(url, **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
     def _normalize_address(self, address: str) -> str:
         """
         Normalizes the address. Handles special Wellington locations and VUW building codes.
@@ -54,37 +341,7 @@ class APIClient:
             logging.error("Empty address provided for normalization")
             return ""
         
-        normalized = address.strip()
-               
-        # Handle VUW building codes like "CO246"
-        vuw_code_pattern = re.compile(r'^([A-Za-z]{2,4})(\d{1,3})$')
-        match = vuw_code_pattern.match(normalized)
-        if match:
-            building_code = match.group(1).upper()
-            buildings = {
-                "CO": "Cotton Building",
-                "MY": "Murphy Building",
-                "MYLT": "Murphy Lecture Theatre",
-                "KK": "Kirk Building",
-                "HM": "Hugh Mackenzie Building",
-                "EA": "Easterfield Building",
-                "VZ": "von Zedlitz Building",
-                "MC": "Maclaurin Building",
-                "AM": "Alan MacDiarmid Building"
-            }
-            if building_code in buildings:
-                normalized = f"Kelburn Parade, Kelburn, Wellington 6012, New Zealand"
-                logging.info(f"Recognized VUW room code '{address}' -> '{normalized}'")
-                return normalized
-
-        # Append Wellington/New Zealand context if missing details.
-        if "wellington" not in normalized.lower() and "new zealand" not in normalized.lower():
-            if not any(loc in normalized.lower() for loc in ["street", "road", "avenue", "drive"]):
-                original = normalized
-                normalized = f"{normalized}, Wellington, New Zealand"
-                logging.info(f"Added Wellington context: '{original}' -> '{normalized}'")
-        
-        return normalized
+        return _normalize_address_cached(address)
     
     def geocode_address(self, address: str):
         """
@@ -96,58 +353,72 @@ class APIClient:
             return None
         
         normalized = self._normalize_address(address)
+        # Nominatim is case-insensitive, so differently-cased spellings share an entry
+        cache_key = normalized.lower()
         
         # Check cache first
-        if normalized in self.geocode_cache:
+        if cache_key in self.geocode_cache:
             logging.info("Cache hit for address '%s'", normalized)
-            return self.geocode_cache[normalized]
+            return self.geocode_cache[cache_key]
         
         # Online mode - continue with regular API call
-        url = Config.OSM_URL or "https://nominatim.openstreetmap.org/search"
+        url = self.osm_url
         params = {"q": normalized, "format": "json", "limit": 1}
-        headers = {"User-Agent": "TransitSync/1.0 (hamishapps@gmail.com)"}
         
         try:
-            # Respect API limits
-            time.sleep(1)
-            response = requests.get(url, params=params, headers=headers)
-            if response.status_code != 200:
-                logging.error("Nominatim geocoding failed: %s", response.text)
-                return None
-            data = response.json()
-            if not data:
-                logging.error("No geocoding result for address: %s", normalized)
-                return None
-            lat = float(data[0]['lat'])
-            lon = float(data[0]['lon'])
-            coords = (lat, lon)
-            logging.info("Geocoded address '%s' to lat: %s, lon: %s", normalized, lat, lon)
-            # Cache the result
-            self.geocode_cache[normalized] = coords
-            return coords
+            with self._geocode_lock:
+                # Another thread may have geocoded this address while we waited
+                if cache_key in self.geocode_cache:
+                    logging.info("Cache hit for address '%s'", normalized)
+                    return self.geocode_cache[cache_key]
+                # Results from earlier runs skip the throttled request entirely
+                if self.disk_cache is not None:
+                    coords = self.disk_cache.get(cache_key)
+                    if coords is not None:
+                        logging.info("Disk cache hit for address '%s'", normalized)
+                        self.geocode_cache[cache_key] = coords
+                        return coords
+                # Respect API limits
+                _nominatim_limiter.acquire()
+                response = self._send("get", url, params=params)
+                if response.status_code != 200:
+                    logging.error("Nominatim geocoding failed: %s", response.text)
+                    return None
+                data = _parse_json(response)
+                if not data:
+                    logging.error("No geocoding result for address: %s", normalized)
+                    return None
+                lat = float(data[0]['lat'])
+                lon = float(data[0]['lon'])
+                coords = (lat, lon)
+                logging.info("Geocoded address '%s' to lat: %s, lon: %s", normalized, lat, lon)
+                # Cache the result
+                self.geocode_cache[cache_key] = coords
+                if self.disk_cache is not None:
+                    self.disk_cache.set(cache_key, coords)
+                return coords
         except Exception as e:
             logging.error("Exception during geocoding: %s", e)
             return None
     
-    def find_nearest_stop(self, lat: float, lon: float):
+    def _get_stops(self):
         """
-        Fetches all stops from the Metlink GTFS stops API and returns the nearest Stop object.
+        Returns the Metlink stops as a (stops, lats) pair: (record, lat, lon,
+        phi, lambda, cos phi) tuples sorted by latitude, with the angles in
+        radians, and the matching list of latitudes for bisecting. Downloads them
+        at most once per stops_ttl. Returns None if they cannot be fetched.
         """
-        url = "https://api.opendata.metlink.org.nz/v1/gtfs/stops"
-        headers = {
-            "accept": "application/json",
-        }
-        
-        if hasattr(Config, 'API_KEY') and Config.API_KEY:
-            headers["x-api-key"] = Config.API_KEY
-            
-        try:
-            response = requests.get(url, headers=headers)
+        with self._stops_lock:
+            if self._stops is not None and time.monotonic() - self._stops_fetched_at < self.stops_ttl:
+                return self._stops
+
+            url = "https://api.opendata.metlink.org.nz/v1/gtfs/stops"
+            response = self._send("get", url, headers=self._metlink_headers)
             if response.status_code != 200:
                 logging.error("Failed to fetch stops: %s", response.text)
                 return None
                 
-            data = response.json()
+            data = _parse_json(response)
             
             # Handle both possible response formats (list or dictionary with 'stops' key)
             stops_data = []
@@ -163,30 +434,81 @@ class APIClient:
                 logging.error("No stops found in response")
                 return None
                 
-            stops = []
-            for stop in stops_data:
-                try:
-                    if all(key in stop for key in ['stop_id', 'stop_name', 'stop_lat', 'stop_lon']):
-                        stop_obj = Stop(
-                            stop_id=stop['stop_id'],
-                            name=stop['stop_name'],
-                            lat=stop['stop_lat'],
-                            lon=stop['stop_lon']
-                        )
-                        stops.append(stop_obj)
-                except Exception as e:
-                    logging.error(f"Error parsing stop: {e}")
+            # Keep the raw records with their parsed coordinates; only the
+            # winning record is turned into a Stop. The per-stop radians and
+            # cosine are computed once here rather than on every scan.
+            try:
+                # Payloads are normally uniform, so try them without per-record checks
+                candidates = [_stop_entry(stop) for stop in stops_data]
+            except (KeyError, TypeError, ValueError):
+                candidates = []
+                for stop in stops_data:
+                    if not isinstance(stop, dict) or not all(key in stop for key in _STOP_FIELDS):
+                        continue
+                    try:
+                        candidates.append(_stop_entry(stop))
+                    except (TypeError, ValueError) as e:
+                        logging.error("Error parsing stop: %s", e)
                     
-            if not stops:
+            if not candidates:
                 logging.error("No valid stops found in response")
                 return None
+
+            candidates.sort(key=lambda c: c[1])
+
+            # A new stop list invalidates nearest-stop results from the old one
+            self._stops = (candidates, [c[1] for c in candidates])
+            self._stops_fetched_at = time.monotonic()
+            self._nearest_stop_cache.clear()
+            return self._stops
+
+    def find_nearest_stop(self, lat: float, lon: float):
+        """
+        Returns the Metlink Stop nearest to the given point.
+        The stop list is downloaded once and reused, and points in the same
+        nearest_stop_precision cell share a result.
+        """
+        cell = (round(lat, self.nearest_stop_precision), round(lon, self.nearest_stop_precision))
+        cached = self._nearest_stop_cache.get(cell)
+        # Cached cells expire with the stop list they were computed from
+        if cached is not None and time.monotonic() - self._stops_fetched_at < self.stops_ttl:
+            return cached
+
+        try:
+            index = self._get_stops()
+            if not index:
+                return None
+            stops, lats = index
                 
-            nearest_stop = min(stops, key=lambda s: haversine_distance(lat, lon, s.lat, s.lon))
-            logging.info(f"Nearest stop found: {nearest_stop}")
+            # Same haversine score as _haversine_score, with the query point's
+            # terms hoisted out of the scan
+            phi1 = math.radians(lat)
+            lambda1 = math.radians(lon)
+            cos_phi1 = math.cos(phi1)
+            sin = math.sin
+
+            def score(c):
+                return sin((c[3] - phi1) / 2) ** 2 + cos_phi1 * c[5] * sin((c[4] - lambda1) / 2) ** 2
+
+            # Score the stops within nearest_stop_band degrees of latitude first.
+            # Every stop outside the band scores more than band_score, so a band
+            # winner at or under it is the nearest overall; otherwise scan all.
+            band = self.nearest_stop_band
+            band_score = sin(math.radians(band) / 2) ** 2
+            lo = bisect_left(lats, lat - band)
+            hi = bisect_right(lats, lat + band)
+            best = min(stops[lo:hi], key=score) if lo < hi else None
+            if best is None or score(best) > band_score:
+                best = min(stops, key=score)
+
+            stop, stop_lat, stop_lon = best[:3]
+            nearest_stop = Stop(stop_id=stop['stop_id'], name=stop['stop_name'], lat=stop_lat, lon=stop_lon)
+            logging.info("Nearest stop found: %s", nearest_stop)
+            self._nearest_stop_cache[cell] = nearest_stop
             return nearest_stop
             
         except Exception as e:
-            logging.error(f"Exception in finding nearest stop: {e}")
+            logging.error("Exception in finding nearest stop: %s", e)
             return None
     
     def query_otp_graphql(self, query: str, variables: dict):
@@ -195,51 +517,89 @@ class APIClient:
         Will try multiple endpoints to find the working one for the OTP server.
         
         Returns the GraphQL query result or None if the query fails.
+        At most otp_max_concurrency queries run at once; extra callers wait.
+        Successful results are reused for otp_cache_ttl seconds.
+        """
+        # The encoded body doubles as the cache key, so nested variables work too
+        body = _dump_json({"query": query, "variables": variables})
+        with self._otp_cache_lock:
+            cached = self._otp_cache.get(body)
+        if cached is not None and cached[0] > time.monotonic():
+            logging.info("OTP cache hit: variables=%s", variables)
+            return cached[1]
+
+        with self._otp_semaphore:
+            result = self._query_otp_graphql(query, variables, body)
+        if result is not None:
+            self._store_otp_result(body, result)
+        return result
+
+    def _store_otp_result(self, body, result):
+        """
+        Caches an OTP result, first purging expired entries and then the
+        oldest ones so the cache never exceeds otp_cache_maxsize.
+        """
+        with self._otp_cache_lock:
+            now = time.monotonic()
+            expired = [key for key, (expires_at, _) in self._otp_cache.items() if expires_at <= now]
+            for key in expired:
+                del self._otp_cache[key]
+            # Re-inserting moves the entry to the end of the eviction order
+            self._otp_cache.pop(body, None)
+            while len(self._otp_cache) >= self.otp_cache_maxsize:
+                del self._otp_cache[next(iter(self._otp_cache))]
+            self._otp_cache[body] = (now + self.otp_cache_ttl, result)
+
+    def _query_otp_graphql(self, query: str, variables: dict, body: bytes):
+        """
+        Sends the pre-encoded `body` to each candidate endpoint in turn;
+        `query`/`variables` must be what it encodes and are only used for logging.
         """
         # Online mode - actual API call
-        base_url = Config.OTP_URL or "http://localhost:8080"
-        headers = {"Content-Type": "application/json"}
+        base_url = self.otp_base_url
+        headers = self._json_headers
 
         # Log the GraphQL query to help with debugging
-        logging.info(f"Sending GraphQL query to OTP: variables={variables}")
-        logging.debug(f"GraphQL query: {query}")
+        logging.info("Sending GraphQL query to OTP: variables=%s", variables)
+        logging.debug("GraphQL query: %s", query)
         
         # If we already found a working endpoint, try it first
         if self.working_graphql_endpoint:
             try:
                 endpoint = f"{base_url}{self.working_graphql_endpoint}"
-                logging.info(f"Using previously working GraphQL endpoint: {endpoint}")
-                response = requests.post(
+                logging.info("Using previously working GraphQL endpoint: %s", endpoint)
+                response = self._send(
+                    "post",
                     endpoint, 
-                    json={"query": query, "variables": variables}, 
+                    data=body,
                     headers=headers,
-                    timeout=30  # Add timeout to prevent hanging requests
+                    timeout=self.otp_timeout  # Add timeout to prevent hanging requests
                 )
                 
                 # Log the response status and details
-                logging.debug(f"GraphQL response status: {response.status_code}")
+                logging.debug("GraphQL response status: %s", response.status_code)
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = _parse_json(response)
                     # Check for GraphQL errors in the response
                     if 'errors' in result:
-                        logging.error(f"GraphQL errors in response: {result['errors']}")
+                        logging.error("GraphQL errors in response: %s", result['errors'])
                         # Continue to try other endpoints if there are GraphQL errors
                         self.working_graphql_endpoint = None
                     else:
                         return result
                 else:
                     # If it's not working anymore, reset and try all endpoints
-                    logging.warning(f"Previously working GraphQL endpoint {endpoint} returned {response.status_code}: {response.text[:200]}")
+                    logging.warning("Previously working GraphQL endpoint %s returned %s: %s", endpoint, response.status_code, response.text[:200])
                     self.working_graphql_endpoint = None
             except requests.exceptions.Timeout:
-                logging.warning(f"Timeout connecting to GraphQL endpoint {base_url}{self.working_graphql_endpoint}")
+                logging.warning("Timeout connecting to GraphQL endpoint %s%s", base_url, self.working_graphql_endpoint)
                 self.working_graphql_endpoint = None
             except requests.exceptions.ConnectionError:
-                logging.warning(f"Connection error with GraphQL endpoint {base_url}{self.working_graphql_endpoint}")
+                logging.warning("Connection error with GraphQL endpoint %s%s", base_url, self.working_graphql_endpoint)
                 self.working_graphql_endpoint = None
             except Exception as e:
-                logging.warning(f"Error with previously working endpoint: {str(e)}")
+                logging.warning("Error with previously working endpoint: %s", e)
                 self.working_graphql_endpoint = None
         
         # Try each endpoint path until we find a working one
@@ -247,55 +607,56 @@ class APIClient:
         for path in self.graphql_endpoints:
             endpoint = f"{base_url}{path}"
             try:
-                logging.info(f"Trying GraphQL endpoint: {endpoint}")
-                response = requests.post(
+                logging.info("Trying GraphQL endpoint: %s", endpoint)
+                response = self._send(
+                    "post",
                     endpoint, 
-                    json={"query": query, "variables": variables}, 
+                    data=body,
                     headers=headers,
-                    timeout=30  # Add timeout to prevent hanging requests
+                    timeout=self.otp_timeout  # Add timeout to prevent hanging requests
                 )
                 
-                logging.debug(f"Endpoint {path} returned status {response.status_code}")
+                logging.debug("Endpoint %s returned status %s", path, response.status_code)
                 
                 if response.status_code == 200:
-                    result = response.json()
+                    result = _parse_json(response)
                     # Check for GraphQL errors in the response
                     if 'errors' in result:
                         error_messages = [error.get('message', 'Unknown GraphQL error') for error in result.get('errors', [])]
-                        logging.error(f"GraphQL errors in response from {path}: {error_messages}")
+                        logging.error("GraphQL errors in response from %s: %s", path, error_messages)
                         # Continue to next endpoint
                         last_error = f"GraphQL errors: {error_messages}"
                     else:
-                        logging.info(f"Found working GraphQL endpoint: {path}")
+                        logging.info("Found working GraphQL endpoint: %s", path)
                         self.working_graphql_endpoint = path
                         return result
                 else:
                     response_text = response.text[:200]  # Limit to first 200 chars to avoid huge logs
-                    logging.warning(f"Endpoint {path} returned {response.status_code}: {response_text}...")
+                    logging.warning("Endpoint %s returned %s: %s...", path, response.status_code, response_text)
                     last_error = f"HTTP {response.status_code}: {response_text}"
             except requests.exceptions.Timeout:
-                logging.warning(f"Timeout connecting to GraphQL endpoint {endpoint}")
+                logging.warning("Timeout connecting to GraphQL endpoint %s", endpoint)
                 last_error = f"Connection timeout for {endpoint}"
             except requests.exceptions.ConnectionError as e:
-                logging.warning(f"Connection error with GraphQL endpoint {endpoint}: {str(e)}")
+                logging.warning("Connection error with GraphQL endpoint %s: %s", endpoint, e)
                 last_error = f"Connection error: {str(e)}"
             except requests.exceptions.RequestException as e:
-                logging.warning(f"Request error with GraphQL endpoint {endpoint}: {str(e)}")
+                logging.warning("Request error with GraphQL endpoint %s: %s", endpoint, e)
                 last_error = f"Request error: {str(e)}"
             except Exception as e:
-                logging.warning(f"Failed to connect to GraphQL endpoint {endpoint}: {str(e)}")
+                logging.warning("Failed to connect to GraphQL endpoint %s: %s", endpoint, e)
                 last_error = str(e)
         
         # If we get here, no endpoint worked
-        logging.error(f"All GraphQL endpoints failed. Last error: {last_error}")
+        logging.error("All GraphQL endpoints failed. Last error: %s", last_error)
         
         # Add some troubleshooting diagnostics
-        logging.error(f"OTP GraphQL connection troubleshooting:")
-        logging.error(f"- Base URL configured: {base_url}")
-        logging.error(f"- Tried endpoints: {self.graphql_endpoints}")
-        logging.error(f"- Check if OTP server is running and accessible")
-        logging.error(f"- Check network connectivity to OTP server")
-        logging.error(f"- Check if OTP server has GraphQL API enabled")
+        logging.error("OTP GraphQL connection troubleshooting:")
+        logging.error("- Base URL configured: %s", base_url)
+        logging.error("- Tried endpoints: %s", self.graphql_endpoints)
+        logging.error("- Check if OTP server is running and accessible")
+        logging.error("- Check network connectivity to OTP server")
+        logging.error("- Check if OTP server has GraphQL API enabled")
                 
         # Return None to indicate failure, no fallback to avoid incorrect data
         return None
@@ -306,19 +667,12 @@ class APIClient:
         """
         # Online mode - actual API call
         url = f"https://api.opendata.metlink.org.nz/v1/stop-predictions?stop_id={stop_id}"
-        headers = {
-            "accept": "application/json",
-        }
-        
-        if hasattr(Config, 'API_KEY') and Config.API_KEY:
-            headers["x-api-key"] = Config.API_KEY
-            
         try:
-            response = requests.get(url, headers=headers)
+            response = self._send("get", url, headers=self._metlink_headers)
             if response.status_code != 200:
                 logging.error("Failed to fetch stop predictions: %s", response.text)
                 return None
-            data = response.json()
+            data = _parse_json(response)
             predictions = data.get("departures", data)
             logging.info("Predictions for stop %s: %s", stop_id, predictions)
             return predictions
@@ -1,8 +1,14 @@
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file if it exists
-load_dotenv()
+# Load environment variables from .env file if it exists.
+# python-dotenv is optional; set TRANSITSYNC_LOAD_DOTENV=0 to skip the lookup.
+if os.environ.get('TRANSITSYNC_LOAD_DOTENV', '1') == '1':
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        pass
+    else:
+        load_dotenv()
 
 class Config:
     """
@@ -18,4 +24,8 @@ class Config:
 
     # OTP Configuration - use environment variable or default to localhost:8080/otp
     OTP_URL = os.environ.get('OTP_URL', 'http://localhost:8080')
-    OSM_URL = os.environ.get('OSM_URL', 'https://nominatim.openstreetmap.org/search')
\ No newline at end of file
+    OSM_URL = os.environ.get('OSM_URL', 'https://nominatim.openstreetmap.org/search')
+
+    # Optional SQLite file for persisting geocoding results between runs
+    GEOCODE_CACHE_PATH = os.environ.get('GEOCODE_CACHE_PATH')
+    GEOCODE_CACHE_MAX_AGE_DAYS = int(os.environ.get('GEOCODE_CACHE_MAX_AGE_DAYS', 30))
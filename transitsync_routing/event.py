@@ -1,7 +1,26 @@
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(datetime_str: str) -> Optional[datetime]:
+    """
+    Parse an ISO format datetime string, returning None if it is invalid.
+    Results are cached since the same timestamps recur across events and routes.
+    """
+    try:
+        return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
 
 class Event:
+    __slots__ = (
+        "id", "summary", "location", "description", "time_zone",
+        "start_str", "end_str", "start_time", "end_time", "sort_key",
+    )
+
     def __init__(self, event_dict: Dict[str, Any]) -> None:
         # Initialize the event with data from a dictionary
         self.id = event_dict.get('id')
@@ -29,15 +48,35 @@ class Event:
         # Parse datetime objects
         self.start_time = self._parse_datetime(self.start_str)
         self.end_time = self._parse_datetime(self.end_str)
+        # Chronological sort key; events without a start time sort first
+        self.sort_key = self.start_time or datetime.min
         
+    @classmethod
+    def from_attributes(cls, *, summary='', location=None, description='',
+                        start_time=None, end_time=None, start_str=None, end_str=None,
+                        time_zone="Pacific/Auckland", id=None) -> "Event":
+        """
+        Build an event from already-parsed values, skipping the dict lookups
+        and datetime parsing done by __init__.
+        """
+        event = cls.__new__(cls)
+        event.id = id
+        event.summary = summary
+        event.location = location
+        event.description = description
+        event.time_zone = time_zone
+        event.start_time = start_time
+        event.end_time = end_time
+        event.start_str = start_str if start_str is not None else (start_time.isoformat() if start_time else None)
+        event.end_str = end_str if end_str is not None else (end_time.isoformat() if end_time else None)
+        event.sort_key = start_time or datetime.min
+        return event
+
     def _parse_datetime(self, datetime_str):
         """Parse an ISO format datetime string."""
-        if not datetime_str:
-            return None
-        try:
-            return datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
-        except (ValueError, AttributeError):
+        if not datetime_str or not isinstance(datetime_str, str):
             return None
+        return parse_datetime(datetime_str)
             
     def to_dict(self) -> Dict[str, Any]:
         """Convert the event to a dictionary format for API calls"""
@@ -0,0 +1,49 @@
+import sqlite3
+import threading
+import time
+
+
+class GeocodeCache:
+    """
+    SQLite-backed store of geocoding results so they survive restarts.
+    Keys are normalized, lowercased addresses; values are (lat, lon) tuples.
+    Entries older than max_age seconds are treated as missing.
+    """
+
+    def __init__(self, path, max_age=30 * 24 * 3600):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # Planner threads share one connection; the lock serializes access
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                "address TEXT PRIMARY KEY, lat REAL NOT NULL, lon REAL NOT NULL, ts INTEGER NOT NULL)"
+            )
+
+    def get(self, address):
+        """Returns the cached (lat, lon) for an address, or None if missing or stale."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT lat, lon, ts FROM geocode WHERE address = ?", (address,)
+            ).fetchone()
+        if row is None or time.time() - row[2] > self.max_age:
+            return None
+        return (row[0], row[1])
+
+    def set(self, address, coords):
+        """Stores the (lat, lon) for an address."""
+        lat, lon = coords
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO geocode (address, lat, lon, ts) VALUES (?, ?, ?, ?)",
+                (address, lat, lon, int(time.time())),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __repr__(self):
+        return f"GeocodeCache({self.path})"
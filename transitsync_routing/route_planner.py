@@ -1,18 +1,105 @@
 import logging
 import datetime
-from .event import Event
-from .api_client import APIClient
+import re
+from itertools import groupby
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
+from .event import Event, parse_datetime
+from .api_client import APIClient, haversine_distance
 from .config import Config
 
+# GraphQL query for OTP v2.7 format - using 'from' and 'to' parameters.
+# Built once at import; only the variables change between event pairs.
+# Whitespace is insignificant in GraphQL, so it is collapsed to keep request bodies small.
+_PLAN_ROUTE_QUERY = " ".join("""
+query PlanRoute($fromLat: Float!, $fromLon: Float!, $toLat: Float!, $toLon: Float!, $date: String!, $time: String!, $arriveBy: Boolean!) {
+  plan(
+    from: {lat: $fromLat, lon: $fromLon}
+    to: {lat: $toLat, lon: $toLon}
+    date: $date
+    time: $time
+    arriveBy: $arriveBy
+    numItineraries: 1
+  ) {
+    itineraries {
+      duration
+      legs {
+        mode
+        startTime
+        endTime
+        from {
+          name
+        }
+        to {
+          name
+        }
+      }
+    }
+  }
+}
+""".split())
+
+
+# Calendar descriptions for generated walking and transit events
+_WALKING_DESCRIPTION = (
+    "⏱️ WALKING DIRECTIONS ⏱️\n\n"
+    "From: {from_event} ({from_location})\n"
+    "To: {to_event} ({to_location})\n\n"
+    "🚶 Estimated walking time: {minutes:.1f} minutes\n"
+)
+_TRANSIT_DESCRIPTION = (
+    "🚌 PUBLIC TRANSIT INFORMATION 🚌\n\n"
+    "From: {from_event} ({from_location})\n"
+    "To: {to_event} ({to_location})\n\n"
+    "⏱️ Travel time: {minutes:.1f} minutes\n"
+    "⏰ Depart at: {departure}\n"
+    "🏁 Arrive by: {arrival}\n"
+)
+
+
+def _otp_time_and_date(dt):
+    """
+    Formats a datetime as OTP's time and date variables, e.g. ("08:45am", "2025-04-10").
+    Equivalent to strftime("%I:%M%p").lower() and strftime("%Y-%m-%d") without
+    going through the locale machinery.
+    """
+    hour12 = dt.hour % 12 or 12
+    suffix = "am" if dt.hour < 12 else "pm"
+    return f"{hour12:02d}:{dt.minute:02d}{suffix}", f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}"
+
+
+def _clock_time(dt):
+    """Formats a datetime as a 12-hour clock time, e.g. "08:45 AM"."""
+    hour12 = dt.hour % 12 or 12
+    suffix = "AM" if dt.hour < 12 else "PM"
+    return f"{hour12:02d}:{dt.minute:02d} {suffix}"
+
+
 class RoutePlanner:
+    # Maximum number of event pairs planned concurrently
+    max_workers = 8
+
+    # Events closer together than this (in km) need no travel between them
+    colocated_distance_km = 0.05
+
+    # Summaries of events created by the transit bot
+    _BOT_EVENT_RE = re.compile(r"Transit:|Walking:|\[TransitBot\]")
+    # Location words suggesting an event already takes place at home
+    _HOME_LOCATION_RE = re.compile(r"home|house|apartment|flat")
+    # Common virtual meeting locations
+    _VIRTUAL_LOCATION_RE = re.compile(r"online|virtual|zoom|meet\.google|teams|webex|skype|phone", re.IGNORECASE)
+
     def __init__(self, events):
         """
         Initialize the RoutePlanner with a list of CalendarEvent objects.
         """
         self.events = events
         self.api_client = APIClient()
+        # Geocoding results for this planner, keyed by stripped, lowercased
+        # location. Failures are stored as None so they are not retried.
+        self._geo_cache = {}
 
-    def is_suitable_event(self, event):
+    def is_suitable_event(self, event, now=None):
         """
         Determines if an event is suitable for transit planning.
         
@@ -24,64 +111,67 @@ class RoutePlanner:
 
         Args:
             event: The event object to check
+            now: Optional timezone-aware current time, so callers filtering many
+                events can read the clock once
 
         Returns:
             bool: True if the event should be processed for transit planning
         """
+        # Cheap attribute checks first, then the regex scans, then the date bound.
+
         # Skip events without locations
         if not event.location or not event.location.strip():
-            logging.debug(f"Skipping event '{event.summary}' - no location")
+            logging.debug("Skipping event '%s' - no location", event.summary)
+            return False
+
+        # Skip events without a start time
+        start_time = event.start_time
+        if not start_time:
+            logging.debug("Skipping event '%s' - no start time", event.summary)
             return False
             
         # Skip events created by the transit bot
-        if any(prefix in event.summary for prefix in ["Transit:", "Walking:", "[TransitBot]"]):
-            logging.debug(f"Skipping bot-created event: {event.summary}")
+        if self._BOT_EVENT_RE.search(event.summary):
+            logging.debug("Skipping bot-created event: %s", event.summary)
             return False
             
         # Skip events with common virtual meeting locations
-        virtual_indicators = ["online", "virtual", "zoom", "meet.google", "teams", "webex", "skype", "phone"]
-        if any(indicator in event.location.lower() for indicator in virtual_indicators):
-            logging.debug(f"Skipping virtual event: {event.summary} at {event.location}")
-            return False
-            
-        # Skip events without a start time
-        if not event.start_time:
-            logging.debug(f"Skipping event '{event.summary}' - no start time")
+        if self._VIRTUAL_LOCATION_RE.search(event.location):
+            logging.debug("Skipping virtual event: %s at %s", event.summary, event.location)
             return False
             
         # Don't process events more than 30 days in the future
         # Fix timezone issue by ensuring both datetimes are timezone-aware
-        if event.start_time:
-            # Get current time with timezone info
+        if now is None:
             now = datetime.datetime.now(datetime.timezone.utc)
+        if not start_time.tzinfo:
+            # If event time is naive, assume it's in UTC for comparison
+            start_time = start_time.replace(tzinfo=datetime.timezone.utc)
+        days_difference = (start_time - now).days
             
-            # If event start_time has timezone info, compare directly
-            if event.start_time.tzinfo:
-                days_difference = (event.start_time - now).days
-            else:
-                # If event time is naive, assume it's in UTC for comparison
-                aware_start = event.start_time.replace(tzinfo=datetime.timezone.utc)
-                days_difference = (aware_start - now).days
-                
-            # Skip if more than 30 days in the future
-            if days_difference > 30:
-                logging.debug(f"Skipping event '{event.summary}' - too far in the future ({days_difference} days)")
-                return False
+        # Skip if more than 30 days in the future
+        if days_difference > 30:
+            logging.debug("Skipping event '%s' - too far in the future (%s days)", event.summary, days_difference)
+            return False
             
         # Successfully passed all filters
         return True
 
-    def plan_route_between_events(self, event1: Event, event2: Event):
+    def plan_route_between_events(self, event1: Event, event2: Event, geocoded=None):
         """
         Plans a transit route between two events using OTP's GraphQL API,
         scheduling the route based on event2's start time.
         Returns None if routing fails - no fallback to incorrect data.
+
+        Args:
+            geocoded: Optional dict of location -> (lat, lon) resolved up front;
+                locations missing from it are geocoded on demand.
         """
         if not event1.location:
-            logging.warning(f"Event '{event1.summary}' is missing a location")
+            logging.warning("Event '%s' is missing a location", event1.summary)
             return None
         if not event2.location:
-            logging.warning(f"Event '{event2.summary}' is missing a location")
+            logging.warning("Event '%s' is missing a location", event2.summary)
             return None
 
         # Determine arrival time: event2.start_time > event1.end_time > now fallback
@@ -93,59 +183,28 @@ class RoutePlanner:
             arrival_dt = datetime.datetime.now()
 
         # Log routing information for debugging
-        logging.info(f"Planning route from '{event1.summary}' at '{event1.location}' to '{event2.summary}' at '{event2.location}'")
-        logging.info(f"Target arrival time: {arrival_dt.isoformat()}")
+        logging.info("Planning route from '%s' at '%s' to '%s' at '%s'", event1.summary, event1.location, event2.summary, event2.location)
+        logging.info("Target arrival time: %s", arrival_dt.isoformat())
 
         # Geocode both event locations
-        logging.debug(f"Geocoding origin: {event1.location}")
-        geo1 = self.api_client.geocode_address(event1.location)
+        logging.debug("Geocoding origin: %s", event1.location)
+        geo1 = self._lookup_location(event1.location, geocoded)
         if geo1 is None:
-            logging.error(f"Failed to geocode for event: {event1.summary} at {event1.location}")
+            logging.error("Failed to geocode for event: %s at %s", event1.summary, event1.location)
             return None
             
-        logging.debug(f"Geocoding destination: {event2.location}")
-        geo2 = self.api_client.geocode_address(event2.location)
+        logging.debug("Geocoding destination: %s", event2.location)
+        geo2 = self._lookup_location(event2.location, geocoded)
         if geo2 is None:
-            logging.error(f"Failed to geocode for event: {event2.summary} at {event2.location}")
+            logging.error("Failed to geocode for event: %s at %s", event2.summary, event2.location)
             return None
 
         lat1, lon1 = geo1
         lat2, lon2 = geo2
-        logging.info(f"Origin coordinates: ({lat1}, {lon1}), Destination coordinates: ({lat2}, {lon2})")
-
-        time_str = arrival_dt.strftime("%I:%M%p").lower()   # Example: "08:45am"
-        date_str = arrival_dt.strftime("%Y-%m-%d")
-
-        # Updated GraphQL query for OTP v2.7 format - using 'from' and 'to' parameters
-        query = """
-        query PlanRoute($fromLat: Float!, $fromLon: Float!, $toLat: Float!, $toLon: Float!, $date: String!, $time: String!, $arriveBy: Boolean!) {
-          plan(
-            from: {lat: $fromLat, lon: $fromLon}
-            to: {lat: $toLat, lon: $toLon}
-            date: $date
-            time: $time
-            arriveBy: $arriveBy
-            numItineraries: 1
-          ) {
-            itineraries {
-              duration
-              legs {
-                mode
-                startTime
-                endTime
-                from {
-                  name
-                }
-                to {
-                  name
-                }
-                distance
-              }
-            }
-          }
-        }
-        """
-        
+        logging.info("Origin coordinates: (%s, %s), Destination coordinates: (%s, %s)", lat1, lon1, lat2, lon2)
+
+        time_str, date_str = _otp_time_and_date(arrival_dt)   # Example: ("08:45am", "2025-04-10")
+
         variables = {
             "fromLat": lat1,
             "fromLon": lon1,
@@ -158,23 +217,23 @@ class RoutePlanner:
 
         # Execute GraphQL query with better error handling
         try:
-            logging.info(f"Executing GraphQL route query for {time_str} on {date_str}")
-            result = self.api_client.query_otp_graphql(query, variables)
+            logging.info("Executing GraphQL route query for %s on %s", time_str, date_str)
+            result = self.api_client.query_otp_graphql(_PLAN_ROUTE_QUERY, variables)
             
             if result is None:
                 logging.error("GraphQL query returned None result")
                 return None
                 
             if "data" not in result:
-                logging.error(f"GraphQL response missing 'data' field: {result}")
+                logging.error("GraphQL response missing 'data' field: %s", result)
                 return None
                 
             if "plan" not in result["data"] or result["data"]["plan"] is None:
-                logging.error(f"GraphQL response missing 'plan' field or plan is null: {result}")
+                logging.error("GraphQL response missing 'plan' field or plan is null: %s", result)
                 return None
                 
             if "errors" in result:
-                logging.error(f"GraphQL query returned errors: {result['errors']}")
+                logging.error("GraphQL query returned errors: %s", result['errors'])
                 return None
             
             plan_data = result["data"]["plan"]
@@ -194,10 +253,10 @@ class RoutePlanner:
             last_leg = chosen["legs"][-1]
             
             try:
-                predicted_departure = datetime.datetime.fromtimestamp(first_leg["startTime"] / 1000).isoformat()
-                estimated_arrival_time = datetime.datetime.fromtimestamp(last_leg["endTime"] / 1000).isoformat()
+                departure_time = datetime.datetime.fromtimestamp(first_leg["startTime"] / 1000)
+                arrival_time = datetime.datetime.fromtimestamp(last_leg["endTime"] / 1000)
             except (KeyError, TypeError, ValueError) as e:
-                logging.error(f"Error parsing leg times: {e}")
+                logging.error("Error parsing leg times: %s", e)
                 return None
             
             route_info = {
@@ -207,18 +266,86 @@ class RoutePlanner:
                 "to_location": event2.location,
                 "from_geocoded": {"lat": lat1, "lon": lon1},
                 "to_geocoded": {"lat": lat2, "lon": lon2},
-                "predicted_departure": predicted_departure,
+                "predicted_departure": departure_time.isoformat(),
+                "predicted_departure_dt": departure_time,
                 "estimated_travel_time_minutes": chosen["duration"] / 60,
-                "estimated_arrival_time": estimated_arrival_time,
+                "estimated_arrival_time": arrival_time.isoformat(),
+                "estimated_arrival_dt": arrival_time,
                 "itinerary": chosen
             }
-            logging.info(f"GraphQL planned route: {route_info['from_location']} → {route_info['to_location']} ({route_info['estimated_travel_time_minutes']:.1f} min)")
+            logging.info("GraphQL planned route: %s → %s (%.1f min)", route_info['from_location'], route_info['to_location'], route_info['estimated_travel_time_minutes'])
             return route_info
             
         except Exception as e:
-            logging.error(f"Error planning route between events: {e}", exc_info=True)
+            logging.error("Error planning route between events: %s", e, exc_info=True)
             return None
     
+    def _geocode(self, location):
+        """
+        Geocodes a location at most once per planner, remembering failures.
+        """
+        key = location.strip().lower()
+        if key in self._geo_cache:
+            return self._geo_cache[key]
+        coords = self.api_client.geocode_address(location)
+        self._geo_cache[key] = coords
+        return coords
+
+    def _lookup_location(self, location, geocoded=None):
+        """
+        Returns coordinates for a location, preferring a pre-resolved mapping.
+        """
+        if geocoded and geocoded.get(location) is not None:
+            return geocoded[location]
+        return self._geocode(location)
+
+    def _geocode_locations(self, locations):
+        """
+        Geocodes each distinct location once.
+        Returns a dict of location -> (lat, lon), or None where geocoding failed.
+        """
+        geocoded = {}
+        for location in locations:
+            if location not in geocoded:
+                geocoded[location] = self._geocode(location)
+        return geocoded
+
+    def _is_colocated(self, pair, geocoded):
+        """
+        Returns True if both events of a pair geocoded to (nearly) the same spot,
+        in which case there is no trip to plan.
+        """
+        geo1 = geocoded.get(pair[0].location)
+        geo2 = geocoded.get(pair[1].location)
+        if geo1 is None or geo2 is None:
+            return False
+        if haversine_distance(*geo1, *geo2) < self.colocated_distance_km:
+            logging.debug("Skipping route from '%s' to '%s' - same location", pair[0].summary, pair[1].summary)
+            return True
+        return False
+
+    def _plan_pairs(self, pairs, geocoded=None):
+        """
+        Plans routes for a list of (from_event, to_event) pairs concurrently.
+        Each pair is I/O bound, so threads overlap the network waits.
+        Pairs whose pre-geocoded locations coincide are skipped.
+        Returns the successful route_info dictionaries in pair order.
+        """
+        if geocoded:
+            pairs = [pair for pair in pairs if not self._is_colocated(pair, geocoded)]
+        if not pairs:
+            return []
+        workers = min(self.max_workers, len(pairs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return [
+                route
+                for route in executor.map(
+                    lambda pair: self.plan_route_between_events(pair[0], pair[1], geocoded=geocoded),
+                    pairs
+                )
+                if route
+            ]
+
     def plan_routes_for_events(self):
         """
         Plans transit routes for each consecutive pair of events.
@@ -228,15 +355,60 @@ class RoutePlanner:
             logging.info("Not enough events to plan routes.")
             return []
 
-        sorted_events = sorted(self.events, key=lambda e: e.start_time or datetime.datetime.min)
-        routes = []
-        for i in range(len(sorted_events) - 1):
-            route = self.plan_route_between_events(sorted_events[i], sorted_events[i+1])
-            if route:
-                routes.append(route)
+        sorted_events = sorted(self.events, key=attrgetter('sort_key'))
+        pairs = list(zip(sorted_events, sorted_events[1:]))
+        geocoded = self._geocode_locations(event.location for event in sorted_events if event.location)
+        routes = self._plan_pairs(pairs, geocoded=geocoded)
         logging.info("Planned routes for events: %s", routes)
         return routes
 
+    def _route_to_event(self, route):
+        """
+        Builds the calendar Event for a planned route: a walking event when the
+        itinerary is a single walk leg, otherwise a transit event.
+        Returns None if the route has no legs.
+        """
+        itinerary = route.get("itinerary")
+        legs = itinerary.get("legs") if itinerary else None
+        if not legs:
+            return None
+        # Routes come from plan_route_between_events, so their keys are known
+        from_location = route["from_location"]
+        to_location = route["to_location"]
+        departure = route["predicted_departure"]
+        arrival = route["estimated_arrival_time"]
+        dep_time = route.get("predicted_departure_dt") or parse_datetime(departure)
+        arr_time = route.get("estimated_arrival_dt") or parse_datetime(arrival)
+        fields = {
+            "from_event": route["from_event"],
+            "from_location": from_location,
+            "to_event": route["to_event"],
+            "to_location": to_location,
+            "minutes": route["estimated_travel_time_minutes"],
+        }
+        # If the itinerary consists solely of walking legs, style accordingly.
+        if len(legs) == 1 and legs[0]["mode"] == "WALK":
+            summary = f"Walking: {from_location} to {to_location}"
+            location = f"Walk from {from_location} to {to_location}"
+            description = _WALKING_DESCRIPTION.format_map(fields)
+        else:
+            summary = f"Transit: {from_location} to {to_location}"
+            location = f"Transit from {from_location} to {to_location}"
+            fields["departure"] = _clock_time(dep_time) if dep_time else "Unknown"
+            fields["arrival"] = _clock_time(arr_time) if arr_time else "Unknown"
+            description = _TRANSIT_DESCRIPTION.format_map(fields)
+        # Times are already parsed, so build the event without the dict round-trip
+        return Event.from_attributes(
+            summary=summary,
+            location=location,
+            description=description,
+            start_time=dep_time,
+            end_time=arr_time,
+            start_str=departure,
+            end_str=arrival,
+            time_zone=Config.TIMEZONE,
+        )
+
     def process_events(self, home_address=None):
         """
         Processes the events, plans routes, and returns a list of CalendarEvent objects
@@ -252,105 +424,63 @@ class RoutePlanner:
         # Set default home address if none provided
         if not home_address:
             home_address = "1 Willis Street, Wellington, New Zealand"
-            logging.info(f"No home address provided, using default: {home_address}")
+            logging.info("No home address provided, using default: %s", home_address)
         
-        # Log events without locations but DON'T set a fallback - skip them instead
+        # Filter in a single pass, logging events without locations as they are
+        # skipped rather than setting a fallback
+        now = datetime.datetime.now(datetime.timezone.utc)
+        filtered_events = []
         for event in self.events:
-            if not event.location or not event.location.strip():
-                logging.info(f"Skipping event without location: {event.summary}")
-                # Don't set a default location
-
-        # Use our new is_suitable_event method to filter events properly
-        filtered_events = [event for event in self.events if self.is_suitable_event(event)]
+            if self.is_suitable_event(event, now):
+                filtered_events.append(event)
+            elif not event.location or not event.location.strip():
+                logging.info("Skipping event without location: %s", event.summary)
 
         if len(filtered_events) < 1:
             logging.info("No suitable events found after filtering.")
             return []
 
-        sorted_events = sorted(filtered_events, key=lambda e: e.start_time or datetime.datetime.min)
-        
-        # Remove duplicate locations in sequence
-        unique_events = [sorted_events[0]]
-        for event in sorted_events[1:]:
-            if event.location.strip().lower() != unique_events[-1].location.strip().lower():
-                unique_events.append(event)
+        # Only suitable events are sorted; they all have a start time, so
+        # untimed (all-day) events never meet timed ones in a comparison
+        sorted_events = sorted(filtered_events, key=attrgetter('sort_key'))
+
+        # Remove duplicate locations in sequence, keeping the first of each run.
+        # Each location is normalized once; the keys are reused for the home check.
+        grouped = [
+            (key, next(group))
+            for key, group in groupby(sorted_events, key=lambda e: e.location.strip().lower())
+        ]
+        unique_events = [event for _, event in grouped]
                 
         # Log the filtered events for debugging
-        logging.info(f"Processing {len(unique_events)} unique suitable events after filtering from {len(self.events)} total events")
-        for idx, event in enumerate(unique_events):
-            logging.info(f"Event {idx+1}: {event.summary} at {event.location} ({event.start_time})")
+        logging.info("Processing %s unique suitable events after filtering from %s total events", len(unique_events), len(self.events))
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            for idx, event in enumerate(unique_events):
+                logging.info("Event %s: %s at %s (%s)", idx+1, event.summary, event.location, event.start_time)
             
-        routes = []
+        pairs = []
         
         # If first event isn't the home address, create a dummy home event.
-        first_event = unique_events[0]
-        if (first_event.location.strip().lower() != home_address.strip().lower() and
-            not any(loc in first_event.location.lower() for loc in ["home", "house", "apartment", "flat"])):
-            home_event = Event({
-                "summary": "Home",
-                "location": home_address,
-                "start": {
-                    "dateTime": (first_event.start_time - datetime.timedelta(hours=1)).isoformat() if first_event.start_time else datetime.datetime.now().isoformat(),
-                    "timeZone": "Pacific/Auckland"
-                }
-            })
-            home_route = self.plan_route_between_events(home_event, first_event)
-            if home_route:
-                routes.append(home_route)
-                logging.info("Added route from home to first event: %s", home_route)
+        first_key, first_event = grouped[0]
+        if (first_key != home_address.strip().lower() and
+            not self._HOME_LOCATION_RE.search(first_key)):
+            home_event = Event.from_attributes(
+                summary="Home",
+                location=home_address,
+                start_time=(first_event.start_time - datetime.timedelta(hours=1)) if first_event.start_time else datetime.datetime.now(),
+                time_zone="Pacific/Auckland",
+            )
+            pairs.append((home_event, first_event))
         
-        for i in range(len(unique_events) - 1):
-            route = self.plan_route_between_events(unique_events[i], unique_events[i+1])
-            if route:
-                routes.append(route)
+        pairs.extend(zip(unique_events, unique_events[1:]))
+
+        # Resolve every distinct location once rather than twice per pair
+        geocoded = self._geocode_locations(
+            event.location for pair in pairs for event in pair
+        )
+        routes = self._plan_pairs(pairs, geocoded=geocoded)
         
         logging.info("Planned %d routes for events", len(routes))
-        calendar_events = []
-        for route in routes:
-            if not route:
-                continue
-            # If the itinerary consists solely of walking legs, style accordingly.
-            if route.get("itinerary") and len(route["itinerary"].get("legs", [])) > 0:
-                legs = route["itinerary"]["legs"]
-                if len(legs) == 1 and legs[0]["mode"] == "WALK":
-                    event_dict = {
-                        "summary": f"Walking: {route['from_location']} to {route['to_location']}",
-                        "location": f"Walk from {route['from_location']} to {route['to_location']}",
-                        "start": {"dateTime": route.get("predicted_departure"), "timeZone": Config.TIMEZONE},
-                        "end": {"dateTime": route.get("estimated_arrival_time"), "timeZone": Config.TIMEZONE},
-                        "description": (
-                            "⏱️ WALKING DIRECTIONS ⏱️\n\n"
-                            f"From: {route['from_event']} ({route['from_location']})\n"
-                            f"To: {route['to_event']} ({route['to_location']})\n\n"
-                            f"🚶 Estimated walking time: {route['estimated_travel_time_minutes']:.1f} minutes\n"
-                        )
-                    }
-                else:
-                    try:
-                        dep_time = datetime.datetime.fromisoformat(route.get("predicted_departure"))
-                        arr_time = datetime.datetime.fromisoformat(route.get("estimated_arrival_time"))
-                        formatted_dep = dep_time.strftime("%I:%M %p")
-                        formatted_arr = arr_time.strftime("%I:%M %p")
-                    except Exception as e:
-                        logging.error("Error formatting times: %s", e)
-                        formatted_dep = "Unknown"
-                        formatted_arr = "Unknown"
-                    
-                    event_dict = {
-                        "summary": f"Transit: {route.get('from_location')} to {route.get('to_location')}",
-                        "location": f"Transit from {route.get('from_location')} to {route.get('to_location')}",
-                        "start": {"dateTime": route.get("predicted_departure"), "timeZone": Config.TIMEZONE},
-                        "end": {"dateTime": route.get("estimated_arrival_time"), "timeZone": Config.TIMEZONE},
-                        "description": (
-                            "🚌 PUBLIC TRANSIT INFORMATION 🚌\n\n"
-                            f"From: {route.get('from_event')} ({route.get('from_location')})\n"
-                            f"To: {route.get('to_event')} ({route.get('to_location')})\n\n"
-                            f"⏱️ Travel time: {route.get('estimated_travel_time_minutes', 0):.1f} minutes\n"
-                            f"⏰ Depart at: {formatted_dep}\n"
-                            f"🏁 Arrive by: {formatted_arr}\n"
-                        )
-                    }
-                calendar_event = Event(event_dict)
-                calendar_events.append(calendar_event)
+        calendar_events = [event for event in map(self._route_to_event, routes) if event]
         logging.info("Created %d calendar events from route planning", len(calendar_events))
         return calendar_events
\ No newline at end of file
@@ -1,4 +1,6 @@
 class Stop:
+    __slots__ = ("stop_id", "name", "lat", "lon")
+
     def __init__(self, stop_id, name, lat, lon):
         self.stop_id = stop_id
         self.name = name